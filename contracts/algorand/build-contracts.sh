@@ -18,15 +18,12 @@ if ! python3 -c "import pyteal" 2>/dev/null; then
     pip3 install pyteal
 fi
 
-# Build TAT-GOV-001: Governance Contract
-echo "Building TAT-GOV-001: Ternary Governance Contract..."
-python3 "$SCRIPT_DIR/ternary-governance-contract.py" > "$BUILD_DIR/tat-gov-001.teal"
-
-# Build TAT-DIST-001: Reward Distributor
-echo "Building TAT-DIST-001: Ternary Reward Distributor..."
-python3 "$SCRIPT_DIR/ternary-reward-distributor.py" > "$BUILD_DIR/tat-dist-001.teal"
+# Compile each contract once and write TEAL (and, with ALGOD_ADDRESS set,
+# assembled bytecode) for TAT-GOV-001 and TAT-DIST-001. Extra arguments,
+# such as --legacy-op-names, are passed through to build.py
+python3 "$SCRIPT_DIR/build.py" "$BUILD_DIR" "$@"
 
 echo ""
 echo "Build complete! Contracts output to: $BUILD_DIR"
-echo "  - tat-gov-001.teal (Governance)"
-echo "  - tat-dist-001.teal (Reward Distributor)"
+echo "  - tat-gov-001.{approval,clear}.teal[.bin] (Governance)"
+echo "  - tat-dist-001.{approval,clear}.teal[.bin] (Reward Distributor)"
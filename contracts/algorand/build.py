@@ -0,0 +1,112 @@
+# Algorand Smart Contract Build
+# Compiles each PyTEAL contract once and writes the artifacts to build/
+# Version: 1.0.0
+#
+# Outputs per contract:
+#   <name>.approval.teal / <name>.clear.teal          TEAL source
+#   <name>.approval.teal.bin / <name>.clear.teal.bin  assembled bytecode
+#   <name>.approval.teal.map.json / ...               PC-to-source-line map
+#
+# Bytecode is assembled through algod's compile endpoint when ALGOD_ADDRESS
+# (and optionally ALGOD_TOKEN) is set. The .bin files are meant to be
+# published with the release so deploy tooling can pass them straight to
+# ApplicationCreateTxn without compiling or assembling at deploy time; the
+# source maps tie bytecode PCs back to TEAL lines for debugging and for
+# locating template values.
+#
+# Usage: build.py [build_dir] [--legacy-op-names]
+#   --legacy-op-names  build the op-name string interface in args[0] instead
+#                      of numeric op codes, for callers not yet migrated
+
+import argparse
+import importlib.util
+import json
+import os
+from base64 import b64decode
+
+from pyteal import compileTeal, Mode, OptimizeOptions
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TEAL_VERSION = 8
+
+CONTRACTS = [
+    ("TAT-GOV-001", "ternary-governance-contract.py", "tat-gov-001"),
+    ("TAT-DIST-001", "ternary-reward-distributor.py", "tat-dist-001"),
+]
+
+
+def load_contract(filename):
+    """Load a contract module from its (hyphenated) source file."""
+    path = os.path.join(SCRIPT_DIR, filename)
+    spec = importlib.util.spec_from_file_location(filename[:-3].replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compile_contract(module, legacy_op_names=False):
+    """Compile the approval and clear programs of a contract module to TEAL."""
+    approval = compileTeal(
+        module.approval_program(legacy_op_names=legacy_op_names),
+        mode=Mode.Application,
+        version=TEAL_VERSION,
+        assembleConstants=True,
+        optimize=OptimizeOptions(scratch_slots=True),
+    )
+    clear = compileTeal(
+        module.clear_state_program(),
+        mode=Mode.Application,
+        version=TEAL_VERSION,
+    )
+    return approval, clear
+
+
+def algod_client():
+    """Return an algod client if ALGOD_ADDRESS is configured, else None."""
+    address = os.environ.get("ALGOD_ADDRESS")
+    if not address:
+        return None
+    from algosdk.v2client.algod import AlgodClient
+    return AlgodClient(os.environ.get("ALGOD_TOKEN", ""), address)
+
+
+def write(path, data):
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def build(build_dir, legacy_op_names=False):
+    os.makedirs(build_dir, exist_ok=True)
+    client = algod_client()
+    if client is None:
+        print("ALGOD_ADDRESS not set; skipping bytecode assembly")
+
+    for tag, filename, name in CONTRACTS:
+        print(f"Building {tag}...")
+        approval, clear = compile_contract(load_contract(filename), legacy_op_names)
+
+        for kind, teal in (("approval", approval), ("clear", clear)):
+            teal_path = os.path.join(build_dir, f"{name}.{kind}.teal")
+            write(teal_path, teal)
+            print(f"  - {os.path.basename(teal_path)}")
+
+            if client is not None:
+                response = client.compile(teal, source_map=True)
+                bytecode = b64decode(response["result"])
+                write(teal_path + ".bin", bytecode)
+                write(teal_path + ".map.json", json.dumps(response["sourcemap"], indent=2))
+                print(f"  - {os.path.basename(teal_path)}.bin ({len(bytecode)} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Algorand contracts")
+    parser.add_argument("build_dir", nargs="?", default=os.path.join(SCRIPT_DIR, "build"))
+    parser.add_argument(
+        "--legacy-op-names",
+        action="store_true",
+        help="dispatch on op-name strings in args[0] instead of numeric op codes",
+    )
+    args = parser.parse_args()
+    build(args.build_dir, legacy_op_names=args.legacy_op_names)
@@ -4,12 +4,24 @@
 
 from pyteal import *
 
-def approval_program():
+# Per-proposal state is packed into a single 32-byte value under
+# "p_" || itob(proposal_id):  for(8) || against(8) || abstain(8) || created(8)
+PROPOSAL_PREFIX = Bytes("p_")
+COUNTER_SIZE = Int(8)
+VOTES_FOR_OFFSET = Int(0)
+VOTES_AGAINST_OFFSET = Int(8)
+VOTES_ABSTAIN_OFFSET = Int(16)
+CREATED_OFFSET = Int(24)
+
+def approval_program(legacy_op_names=False):
     """
     Ternary Governance Contract (TAT-GOV-001)
     
     Manages governance voting and proposal execution for the Salvi Framework.
     Implements ternary voting logic with A/B/C representation support.
+    
+    Ops are selected by a numeric op code in args[0]. Pass
+    legacy_op_names=True to build the original op-name string interface.
     """
     
     # Global state keys
@@ -18,27 +30,21 @@ def approval_program():
     quorum_threshold_key = Bytes("quorum_threshold")
     voting_period_key = Bytes("voting_period")
     
-    # Proposal state keys (per proposal)
+    # Proposal state key (per proposal)
     def proposal_key(proposal_id):
-        return Concat(Bytes("proposal_"), Itob(proposal_id))
-    
-    def votes_for_key(proposal_id):
-        return Concat(Bytes("votes_for_"), Itob(proposal_id))
+        return Concat(PROPOSAL_PREFIX, Itob(proposal_id))
     
-    def votes_against_key(proposal_id):
-        return Concat(Bytes("votes_against_"), Itob(proposal_id))
+    # Operations. args[0] carries a numeric op code; contracts compiled with
+    # legacy_op_names=True keep the original op-name strings instead
+    def op_code(name, code):
+        return Bytes(name) if legacy_op_names else Int(code)
     
-    def votes_abstain_key(proposal_id):
-        return Concat(Bytes("votes_abstain_"), Itob(proposal_id))
-    
-    # Operations
-    op_create_proposal = Bytes("create_proposal")
-    op_vote = Bytes("vote")
-    op_execute_proposal = Bytes("execute_proposal")
-    op_update_quorum = Bytes("update_quorum")
+    op_create_proposal = op_code("create_proposal", 1)
+    op_vote = op_code("vote", 2)
+    op_execute_proposal = op_code("execute_proposal", 3)
+    op_update_quorum = op_code("update_quorum", 4)
     
     # Initialize contract
-    @Subroutine(TealType.uint64)
     def init():
         return Seq([
             App.globalPut(admin_key, Txn.sender()),
@@ -49,70 +55,101 @@ def approval_program():
         ])
     
     # Create a new proposal
-    @Subroutine(TealType.uint64)
     def create_proposal():
-        proposal_id = App.globalGet(proposal_count_key) + Int(1)
+        proposal_id = ScratchVar(TealType.uint64)
+        ts = ScratchVar(TealType.uint64)
         return Seq([
-            App.globalPut(proposal_count_key, proposal_id),
-            App.globalPut(proposal_key(proposal_id), Global.latest_timestamp()),
-            App.globalPut(votes_for_key(proposal_id), Int(0)),
-            App.globalPut(votes_against_key(proposal_id), Int(0)),
-            App.globalPut(votes_abstain_key(proposal_id), Int(0)),
+            ts.store(Global.latest_timestamp()),
+            proposal_id.store(App.globalGet(proposal_count_key) + Int(1)),
+            App.globalPut(proposal_count_key, proposal_id.load()),
+            App.globalPut(
+                proposal_key(proposal_id.load()),
+                Concat(BytesZero(CREATED_OFFSET), Itob(ts.load()))
+            ),
             Return(Int(1))
         ])
     
     # Cast a vote on a proposal
     # Vote types: 1 = For (A), 2 = Against (B), 3 = Abstain (C)
-    @Subroutine(TealType.uint64)
     def vote():
-        proposal_id = Btoi(Txn.application_args[1])
-        vote_type = Btoi(Txn.application_args[2])
+        proposal_id = ScratchVar(TealType.uint64)
+        vote_type = ScratchVar(TealType.uint64)
+        key = ScratchVar(TealType.bytes)
+        counters = ScratchVar(TealType.bytes)
+        offset = ScratchVar(TealType.uint64)
         
         return Seq([
-            Assert(vote_type >= Int(1)),
-            Assert(vote_type <= Int(3)),
-            If(vote_type == Int(1),
-                App.globalPut(
-                    votes_for_key(proposal_id),
-                    App.globalGet(votes_for_key(proposal_id)) + Int(1)
-                ),
-            If(vote_type == Int(2),
-                App.globalPut(
-                    votes_against_key(proposal_id),
-                    App.globalGet(votes_against_key(proposal_id)) + Int(1)
-                ),
-                App.globalPut(
-                    votes_abstain_key(proposal_id),
-                    App.globalGet(votes_abstain_key(proposal_id)) + Int(1)
+            proposal_id.store(Btoi(Txn.application_args[1])),
+            vote_type.store(Btoi(Txn.application_args[2])),
+            Assert(vote_type.load() >= Int(1)),
+            Assert(vote_type.load() <= Int(3)),
+            key.store(proposal_key(proposal_id.load())),
+            counters.store(App.globalGet(key.load())),
+            # Counters are laid out in vote-type order, so the offset is
+            # computed directly instead of branching on the vote type
+            offset.store((vote_type.load() - Int(1)) * COUNTER_SIZE),
+            # Bump the selected counter in place; one read and one write per vote
+            App.globalPut(
+                key.load(),
+                Replace(
+                    counters.load(),
+                    offset.load(),
+                    Itob(ExtractUint64(counters.load(), offset.load()) + Int(1))
                 )
-            )),
+            ),
             Return(Int(1))
         ])
     
     # Execute a passed proposal
-    @Subroutine(TealType.uint64)
     def execute_proposal():
         proposal_id = Btoi(Txn.application_args[1])
-        votes_for = App.globalGet(votes_for_key(proposal_id))
-        votes_against = App.globalGet(votes_against_key(proposal_id))
-        total_votes = votes_for + votes_against
+        
+        # Cache the packed counters in scratch so the proposal slot is read once
+        counters = ScratchVar(TealType.bytes)
+        vf = ScratchVar(TealType.uint64)
+        va = ScratchVar(TealType.uint64)
+        quorum = ScratchVar(TealType.uint64)
+        total_votes = ScratchVar(TealType.uint64)
         
         return Seq([
-            Assert(total_votes > Int(0)),
-            Assert((votes_for * Int(100)) / total_votes >= App.globalGet(quorum_threshold_key)),
+            counters.store(App.globalGet(proposal_key(proposal_id))),
+            vf.store(ExtractUint64(counters.load(), VOTES_FOR_OFFSET)),
+            va.store(ExtractUint64(counters.load(), VOTES_AGAINST_OFFSET)),
+            quorum.store(App.globalGet(quorum_threshold_key)),
+            total_votes.store(vf.load() + va.load()),
+            Assert(total_votes.load() > Int(0)),
+            # votes_for / total >= quorum%, cross-multiplied to avoid division
+            Assert(vf.load() * Int(100) >= quorum.load() * total_votes.load()),
             Log(Bytes("PROPOSAL_EXECUTED")),
             Return(Int(1))
         ])
     
-    # Main router
-    program = Cond(
-        [Txn.application_id() == Int(0), init()],
-        [Txn.on_completion() == OnComplete.OptIn, Return(Int(1))],
-        [Txn.on_completion() == OnComplete.CloseOut, Return(Int(1))],
-        [Txn.on_completion() == OnComplete.DeleteApplication, Return(Txn.sender() == App.globalGet(admin_key))],
-        [Txn.application_args[0] == op_create_proposal, create_proposal()],
-        [Txn.application_args[0] == op_vote, vote()],
-        [Txn.application_args[0] == op_execute_proposal, execute_proposal()],
+    # Op dispatch; args[0] is decoded into scratch once rather than per arm,
+    # so each arm is a single integer compare (a byte compare in legacy mode)
+    op = ScratchVar(TealType.bytes if legacy_op_names else TealType.uint64)
+    op_router = Seq([
+        op.store(Txn.application_args[0] if legacy_op_names else Btoi(Txn.application_args[0])),
+        Cond(
+            [op.load() == op_vote, vote()],
+            [op.load() == op_create_proposal, create_proposal()],
+            [op.load() == op_execute_proposal, execute_proposal()],
+        )
+    ])
+    
+    # Main router. A single NoOp check sends op calls straight to the op
+    # router; only other OnCompletion values reach the lifecycle arms
+    oc = ScratchVar(TealType.uint64)
+    lifecycle = Cond(
+        [oc.load() == OnComplete.OptIn, Return(Int(1))],
+        [oc.load() == OnComplete.CloseOut, Return(Int(1))],
+        [oc.load() == OnComplete.DeleteApplication, Return(Txn.sender() == App.globalGet(admin_key))],
+    )
+    program = If(Txn.application_id() == Int(0),
+        init(),
+        Seq([
+            oc.store(Txn.on_completion()),
+            If(oc.load() == OnComplete.NoOp, op_router, lifecycle)
+        ])
     )
     
     return program
@@ -121,9 +158,17 @@ def clear_state_program():
     return Return(Int(1))
 
 if __name__ == "__main__":
-    from pyteal import compileTeal, Mode
+    # Pass --legacy-op-names to print the op-name string interface
+    import sys
+    from pyteal import compileTeal, Mode, OptimizeOptions
     
     print("// TAT-GOV-001 Approval Program")
-    print(compileTeal(approval_program(), mode=Mode.Application, version=8))
+    print(compileTeal(
+        approval_program(legacy_op_names="--legacy-op-names" in sys.argv),
+        mode=Mode.Application,
+        version=8,
+        assembleConstants=True,
+        optimize=OptimizeOptions(scratch_slots=True),
+    ))
     print("\n// TAT-GOV-001 Clear State Program")
     print(compileTeal(clear_state_program(), mode=Mode.Application, version=8))
@@ -4,127 +4,202 @@
 
 from pyteal import *
 
-def approval_program():
+# Efficiency bonus rates are expressed in basis points
+BASIS_POINTS = Int(10000)
+
+# Per-user local state is packed into a single 24-byte value under "u":
+# rewards(8) || operations(8) || last_claim(8)
+USER_BLOB = Bytes("u")
+REWARDS_OFFSET = Int(0)
+OPERATIONS_OFFSET = Int(8)
+LAST_CLAIM_OFFSET = Int(16)
+USER_BLOB_SIZE = Int(24)
+
+# Admin and oracle addresses share one global value under "auth":
+# admin(32) || oracle(32)
+AUTH = Bytes("auth")
+ADMIN_OFFSET = Int(0)
+ORACLE_OFFSET = Int(32)
+ADDRESS_SIZE = Int(32)
+
+def approval_program(legacy_op_names=False):
     """
     Ternary Reward Distributor Contract (TAT-DIST-001)
     
     Distributes rewards based on witnessed operations from Hedera HCS.
     Supports ternary-weighted distribution with compression efficiency bonuses.
+    
+    Ops are selected by a numeric op code in args[0]. Pass
+    legacy_op_names=True to build the original op-name string interface.
     """
     
     # Global state keys
-    admin_key = Bytes("admin")
-    oracle_key = Bytes("oracle")
     total_distributed_key = Bytes("total_distributed")
     distribution_count_key = Bytes("distribution_count")
     efficiency_bonus_rate_key = Bytes("efficiency_bonus_rate")
     
-    # Local state keys (per user)
-    user_rewards_key = Bytes("rewards")
-    user_operations_key = Bytes("operations")
-    user_last_claim_key = Bytes("last_claim")
+    # Operations. args[0] carries a numeric op code; contracts compiled with
+    # legacy_op_names=True keep the original op-name strings instead
+    def op_code(name, code):
+        return Bytes(name) if legacy_op_names else Int(code)
     
-    # Operations
-    op_set_oracle = Bytes("set_oracle")
-    op_record_operation = Bytes("record_operation")
-    op_distribute_rewards = Bytes("distribute_rewards")
-    op_claim_rewards = Bytes("claim_rewards")
-    op_update_efficiency_rate = Bytes("update_efficiency_rate")
+    op_set_oracle = op_code("set_oracle", 1)
+    op_record_operation = op_code("record_operation", 2)
+    op_distribute_rewards = op_code("distribute_rewards", 3)
+    op_claim_rewards = op_code("claim_rewards", 4)
+    op_update_efficiency_rate = op_code("update_efficiency_rate", 5)
+    
+    def init_user_blob():
+        return App.localPut(Txn.sender(), USER_BLOB, BytesZero(USER_BLOB_SIZE))
     
-    @Subroutine(TealType.uint64)
     def init():
         return Seq([
-            App.globalPut(admin_key, Txn.sender()),
-            App.globalPut(oracle_key, Global.zero_address()),
+            App.globalPut(AUTH, Concat(Txn.sender(), Global.zero_address())),
             App.globalPut(total_distributed_key, Int(0)),
             App.globalPut(distribution_count_key, Int(0)),
             App.globalPut(efficiency_bonus_rate_key, Int(5850)),  # 58.50% efficiency bonus (in basis points)
+            # A creator opting in during creation never reaches the OptIn arm
+            If(Txn.on_completion() == OnComplete.OptIn, init_user_blob()),
             Return(Int(1))
         ])
     
-    @Subroutine(TealType.uint64)
-    def is_admin():
-        return Txn.sender() == App.globalGet(admin_key)
+    # Role checks are plain expressions so they inline at each call site
+    # instead of costing a callsub/retsub. Pass a cached copy of the packed
+    # auth value when a handler checks more than one role
+    def is_admin(sender, auth=None):
+        auth = App.globalGet(AUTH) if auth is None else auth
+        return sender == Extract(auth, ADMIN_OFFSET, ADDRESS_SIZE)
     
-    @Subroutine(TealType.uint64)
-    def is_oracle():
-        return Txn.sender() == App.globalGet(oracle_key)
+    def is_oracle(sender, auth=None):
+        auth = App.globalGet(AUTH) if auth is None else auth
+        return sender == Extract(auth, ORACLE_OFFSET, ADDRESS_SIZE)
     
-    @Subroutine(TealType.uint64)
     def set_oracle():
         new_oracle = Txn.accounts[1]
+        auth = ScratchVar(TealType.bytes)
         return Seq([
-            Assert(is_admin()),
-            App.globalPut(oracle_key, new_oracle),
+            auth.store(App.globalGet(AUTH)),
+            Assert(is_admin(Txn.sender(), auth.load())),
+            App.globalPut(AUTH, Replace(auth.load(), ORACLE_OFFSET, new_oracle)),
             Return(Int(1))
         ])
     
-    @Subroutine(TealType.uint64)
     def record_operation():
         user = Txn.accounts[1]
-        operation_value = Btoi(Txn.application_args[1])
+        operation_value = ScratchVar(TealType.uint64)
         ternary_efficiency = Btoi(Txn.application_args[2])
-        
-        # Calculate reward with ternary efficiency bonus
-        efficiency_bonus = (operation_value * App.globalGet(efficiency_bonus_rate_key)) / Int(10000)
-        base_reward = operation_value + efficiency_bonus
+        base_reward = ScratchVar(TealType.uint64)
+        sender = ScratchVar(TealType.bytes)
+        auth = ScratchVar(TealType.bytes)
+        blob = ScratchVar(TealType.bytes)
         
         return Seq([
-            Assert(Or(is_admin(), is_oracle())),
-            App.localPut(
-                user,
-                user_rewards_key,
-                App.localGet(user, user_rewards_key) + base_reward
-            ),
-            App.localPut(
-                user,
-                user_operations_key,
-                App.localGet(user, user_operations_key) + Int(1)
+            sender.store(Txn.sender()),
+            # One global read covers both role checks
+            auth.store(App.globalGet(AUTH)),
+            Assert(Or(
+                is_admin(sender.load(), auth.load()),
+                is_oracle(sender.load(), auth.load())
+            )),
+            # Calculate reward with ternary efficiency bonus. Kept as
+            # value + value * rate / 10000 rather than value * (10000 + rate)
+            # / 10000, which overflows uint64 at much smaller values
+            operation_value.store(Btoi(Txn.application_args[1])),
+            base_reward.store(
+                operation_value.load()
+                + operation_value.load()
+                * App.globalGet(efficiency_bonus_rate_key)
+                / BASIS_POINTS
             ),
+            # One local read and one local write for both counters
+            blob.store(App.localGet(user, USER_BLOB)),
+            blob.store(Replace(
+                blob.load(),
+                REWARDS_OFFSET,
+                Itob(ExtractUint64(blob.load(), REWARDS_OFFSET) + base_reward.load())
+            )),
+            blob.store(Replace(
+                blob.load(),
+                OPERATIONS_OFFSET,
+                Itob(ExtractUint64(blob.load(), OPERATIONS_OFFSET) + Int(1))
+            )),
+            App.localPut(user, USER_BLOB, blob.load()),
             App.globalPut(
                 distribution_count_key,
                 App.globalGet(distribution_count_key) + Int(1)
             ),
-            Log(Concat(Bytes("OPERATION_RECORDED:"), Itob(base_reward))),
+            # Tag and value are logged as separate entries to skip a concat
+            Log(Bytes("OPERATION_RECORDED:")),
+            Log(Itob(base_reward.load())),
             Return(Int(1))
         ])
     
-    @Subroutine(TealType.uint64)
     def claim_rewards():
-        user_rewards = App.localGet(Txn.sender(), user_rewards_key)
+        blob = ScratchVar(TealType.bytes)
+        user_rewards = ScratchVar(TealType.uint64)
+        ts = ScratchVar(TealType.uint64)
         
         return Seq([
-            Assert(user_rewards > Int(0)),
-            App.localPut(Txn.sender(), user_rewards_key, Int(0)),
-            App.localPut(Txn.sender(), user_last_claim_key, Global.latest_timestamp()),
+            ts.store(Global.latest_timestamp()),
+            blob.store(App.localGet(Txn.sender(), USER_BLOB)),
+            user_rewards.store(ExtractUint64(blob.load(), REWARDS_OFFSET)),
+            Assert(user_rewards.load() > Int(0)),
+            # Zero rewards and stamp the claim time in a single local write
+            App.localPut(
+                Txn.sender(),
+                USER_BLOB,
+                Replace(
+                    Replace(blob.load(), REWARDS_OFFSET, Itob(Int(0))),
+                    LAST_CLAIM_OFFSET,
+                    Itob(ts.load())
+                )
+            ),
             App.globalPut(
                 total_distributed_key,
-                App.globalGet(total_distributed_key) + user_rewards
+                App.globalGet(total_distributed_key) + user_rewards.load()
             ),
-            Log(Concat(Bytes("REWARDS_CLAIMED:"), Itob(user_rewards))),
+            Log(Bytes("REWARDS_CLAIMED:")),
+            Log(Itob(user_rewards.load())),
             Return(Int(1))
         ])
     
-    @Subroutine(TealType.uint64)
     def update_efficiency_rate():
-        new_rate = Btoi(Txn.application_args[1])
+        new_rate = ScratchVar(TealType.uint64)
         return Seq([
-            Assert(is_admin()),
-            Assert(new_rate <= Int(10000)),  # Max 100%
-            App.globalPut(efficiency_bonus_rate_key, new_rate),
+            Assert(is_admin(Txn.sender())),
+            new_rate.store(Btoi(Txn.application_args[1])),
+            Assert(new_rate.load() <= BASIS_POINTS),  # Max 100%
+            App.globalPut(efficiency_bonus_rate_key, new_rate.load()),
             Return(Int(1))
         ])
     
-    # Main router
-    program = Cond(
-        [Txn.application_id() == Int(0), init()],
-        [Txn.on_completion() == OnComplete.OptIn, Return(Int(1))],
-        [Txn.on_completion() == OnComplete.CloseOut, Return(Int(1))],
-        [Txn.on_completion() == OnComplete.DeleteApplication, Return(is_admin())],
-        [Txn.application_args[0] == op_set_oracle, set_oracle()],
-        [Txn.application_args[0] == op_record_operation, record_operation()],
-        [Txn.application_args[0] == op_claim_rewards, claim_rewards()],
-        [Txn.application_args[0] == op_update_efficiency_rate, update_efficiency_rate()],
+    # Op dispatch; args[0] is decoded into scratch once rather than per arm,
+    # so each arm is a single integer compare (a byte compare in legacy mode)
+    op = ScratchVar(TealType.bytes if legacy_op_names else TealType.uint64)
+    op_router = Seq([
+        op.store(Txn.application_args[0] if legacy_op_names else Btoi(Txn.application_args[0])),
+        Cond(
+            [op.load() == op_record_operation, record_operation()],
+            [op.load() == op_claim_rewards, claim_rewards()],
+            [op.load() == op_update_efficiency_rate, update_efficiency_rate()],
+            [op.load() == op_set_oracle, set_oracle()],
+        )
+    ])
+    
+    # Main router. A single NoOp check sends op calls straight to the op
+    # router; only other OnCompletion values reach the lifecycle arms
+    oc = ScratchVar(TealType.uint64)
+    lifecycle = Cond(
+        [oc.load() == OnComplete.OptIn, Seq([init_user_blob(), Return(Int(1))])],
+        [oc.load() == OnComplete.CloseOut, Return(Int(1))],
+        [oc.load() == OnComplete.DeleteApplication, Return(is_admin(Txn.sender()))],
+    )
+    program = If(Txn.application_id() == Int(0),
+        init(),
+        Seq([
+            oc.store(Txn.on_completion()),
+            If(oc.load() == OnComplete.NoOp, op_router, lifecycle)
+        ])
     )
     
     return program
@@ -133,9 +208,17 @@ def clear_state_program():
     return Return(Int(1))
 
 if __name__ == "__main__":
-    from pyteal import compileTeal, Mode
+    # Pass --legacy-op-names to print the op-name string interface
+    import sys
+    from pyteal import compileTeal, Mode, OptimizeOptions
     
     print("// TAT-DIST-001 Approval Program")
-    print(compileTeal(approval_program(), mode=Mode.Application, version=8))
+    print(compileTeal(
+        approval_program(legacy_op_names="--legacy-op-names" in sys.argv),
+        mode=Mode.Application,
+        version=8,
+        assembleConstants=True,
+        optimize=OptimizeOptions(scratch_slots=True),
+    ))
     print("\n// TAT-DIST-001 Clear State Program")
     print(compileTeal(clear_state_program(), mode=Mode.Application, version=8))
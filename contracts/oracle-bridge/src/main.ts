@@ -23,9 +23,16 @@ interface HederaMessage {
   runningHash: string;
 }
 
+// TAT-DIST-001 op codes, sent as args[0]. Contracts built with
+// `build.py --legacy-op-names` expect the method name string instead.
+const DISTRIBUTOR_OP_CODES = {
+  record_operation: 2,
+} as const;
+
 interface AlgorandSubmission {
   appId: number;
   method: string;
+  opCode: number;
   args: string[];
   txId?: string;
 }
@@ -77,6 +84,7 @@ class AlgorandSubmitter {
     return {
       appId: this.appId,
       method: 'record_operation',
+      opCode: DISTRIBUTOR_OP_CODES.record_operation,
       args: [proof.operationId, proof.dataHash, proof.hederaTransactionId],
       txId: this.generateTxId()
     };